@@ -15,10 +15,16 @@ import sys
 import os
 import hashlib
 import json
+import tempfile
 import requests
 import time
+import argparse
 from tabulate import tabulate
 from colorama import init, Fore, Style, Back
+import tracing
+
+# Every table render shows up as its own span on the trace timeline
+tabulate = tracing.traced("render.tabulate")(tabulate)
 
 def check_python_environment():
 
@@ -104,8 +110,6 @@ def verify_system_requirements():
     print("🎯 System ready for breach hunting!")
     print("=" * 50)
 
-verify_system_requirements()
-
 init(autoreset=True)
 
 class C:
@@ -140,6 +144,10 @@ def print_banner():
 BASE = "https://api.xposedornot.com/v1"
 PASS_API = "https://passwords.xposedornot.com/v1"
 
+# When set, lookups go through a shared lookupservice.py instance instead of the upstream APIs
+SERVICE = os.environ.get("BREACHCHECKER_SERVICE", "").rstrip("/")
+
+@tracing.traced("spin")
 def spin(msg, t=1.5):
     
     chars = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
@@ -166,7 +174,8 @@ def handle(r):
     
     if r.status_code == 200:
         print(f"{C.S}✓ Response: {C.G}200 OK{C.N}")
-        return r.json()
+        with tracing.span("decode.json"):
+            return r.json()
     elif r.status_code == 404:
         print(f"{C.W}⚠ Status: {C.W}404 NOT FOUND{C.N}")
     elif r.status_code == 429:
@@ -175,6 +184,91 @@ def handle(r):
         print(f"{C.E}✖ Status: {C.E}HTTP {r.status_code}{C.N}")
     return None
 
+CACHE_FILE = os.path.join(os.path.expanduser("~"), ".breachchecker_cache.json")
+
+# requests already advertises gzip/deflate, plus br/zstd when a decoder is installed
+catalog_session = requests.Session()
+
+def load_cache():
+
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache):
+
+    try:
+        # Unique temp file so concurrent writers never interleave, the rename is atomic
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', delete=False,
+                                         dir=os.path.dirname(CACHE_FILE), suffix='.tmp') as f:
+            json.dump(cache, f)
+        os.replace(f.name, CACHE_FILE)
+    except OSError:
+        pass  # caching is best effort, a failed write just means a full fetch next time
+
+def catalog_request(method, url, headers=None, timeout=10):
+    """Fetch a catalog endpoint, returns (status_code, data, from_cache)"""
+    # Validators only mean "send 304" for GET/HEAD, other methods answer a match with 412
+    if method not in ("GET", "HEAD"):
+        with tracing.span("http.catalog", method=method, url=url):
+            r = catalog_session.request(method, url, headers=headers, timeout=timeout)
+        if r.status_code != 200:
+            return r.status_code, None, False
+        with tracing.span("decode.json"):
+            return 200, r.json(), False
+
+    key = f"{method} {url}"
+    with tracing.span("cache.load"):
+        cache = load_cache()
+    entry = cache.get(key)
+
+    hdrs = dict(headers or {})
+    if entry:
+        if entry.get("etag"):
+            hdrs['If-None-Match'] = entry["etag"]
+        if entry.get("last_modified"):
+            hdrs['If-Modified-Since'] = entry["last_modified"]
+
+    with tracing.span("http.catalog", method=method, url=url):
+        r = catalog_session.request(method, url, headers=hdrs, timeout=timeout)
+    if r.status_code == 304 and entry:
+        return 304, entry["data"], True
+    if r.status_code != 200:
+        return r.status_code, None, False
+
+    with tracing.span("decode.json"):
+        data = r.json()
+    etag, modified = r.headers.get('ETag'), r.headers.get('Last-Modified')
+    if etag or modified:
+        cache[key] = {"etag": etag, "last_modified": modified, "data": data}
+        with tracing.span("cache.save"):
+            save_cache(cache)
+    return 200, data, False
+
+def api_get(kind, url, params, timeout=10):
+    
+    with tracing.span(f"http.{kind}", service=bool(SERVICE)):
+        if SERVICE:
+            return requests.get(f"{SERVICE}/{kind}", params=params, timeout=timeout)
+        return requests.get(url, timeout=timeout)
+
+def fetch_catalog(method, url, headers=None, timeout=10):
+
+    status, data, cached = catalog_request(method, url, headers, timeout)
+    if cached:
+        print(f"{C.S}✓ Response: {C.G}304 NOT MODIFIED{C.N} {C.I}(using local copy){C.N}")
+    elif status == 200:
+        print(f"{C.S}✓ Response: {C.G}200 OK{C.N}")
+    elif status == 404:
+        print(f"{C.W}⚠ Status: {C.W}404 NOT FOUND{C.N}")
+    elif status == 429:
+        print(f"{C.E}⚠ Status: {C.E}429 RATE LIMITED{C.N}")
+    else:
+        print(f"{C.E}✖ Status: {C.E}HTTP {status}{C.N}")
+    return data
+
 def check_email():
     
     print_section_header("🔍 EMAIL BREACH SCANNER")
@@ -184,7 +278,7 @@ def check_email():
     spin("Scanning breach databases", 2.0)
     
     try:
-        data = handle(requests.get(f"{BASE}/check-email/{e}", timeout=10))
+        data = handle(api_get("email", f"{BASE}/check-email/{e}", {"email": e}))
         if not data: return
         
         breaches = data.get("breaches", [])
@@ -217,7 +311,7 @@ def breach_analytics():
     spin("Analyzing breach patterns", 2.5)
     
     try:
-        data = handle(requests.get(f"{BASE}/breach-analytics?email={e}", timeout=10))
+        data = handle(api_get("analytics", f"{BASE}/breach-analytics?email={e}", {"email": e}))
         if not data: return
         
         m = data.get("BreachMetrics", {})
@@ -285,7 +379,7 @@ def check_password():
     spin("Querying breach databases", 2.0)
     
     try:
-        data = handle(requests.get(f"{PASS_API}/pass/anon/{h}", timeout=10))
+        data = handle(api_get("password", f"{PASS_API}/pass/anon/{h}", {"prefix": h}))
         if not data:
             print(f"\n{C.S}✅ PASSWORD STATUS: SECURE{C.N}")
             print(f"{C.S}{'▓' * 40}{C.N}")
@@ -327,6 +421,87 @@ def check_password():
     except Exception as ex:
         print(f"{C.E}❌ ERROR: {ex}{C.N}")
 
+def sort_key(v):
+    
+    if v is None or str(v).strip() in ("", "N/A", "Unknown"):
+        return (2, "")
+    if isinstance(v, (int, float)):
+        return (0, v)
+    return (1, str(v).lower())
+
+def sort_view(view, rows, col, desc):
+    """Sort row indexes by a column, missing and non-numeric values stay last either way"""
+    groups = {}
+    for i in view:
+        groups.setdefault(sort_key(rows[i][col])[0], []).append(i)
+    ordered = []
+    for rank in sorted(groups):
+        ordered.extend(sorted(groups[rank], key=lambda i: sort_key(rows[i][col])[1], reverse=desc))
+    return ordered
+
+def fmt_cell(v):
+    
+    return f"{v:,}" if isinstance(v, int) else str(v)
+
+def page_view(title, headers, rows, colors, page_size=20):
+    """Paged table viewer, only the visible window of rows is colored and rendered"""
+    # Lowercased row text is built once so searches never touch the raw records again
+    index = [" ".join(str(v) for v in row).lower() for row in rows]
+    query, sort_col, sort_desc, page = "", None, False, 0
+    view = list(range(len(rows)))
+    
+    while True:
+        pages = max(1, (len(view) + page_size - 1) // page_size)
+        page = min(max(page, 0), pages - 1)
+        start = page * page_size
+        window = view[start:start + page_size]
+        
+        tbl = []
+        for pos, idx in enumerate(window, start + 1):
+            tbl.append([f"{C.W}{pos}{C.N}"] +
+                       [f"{color}{fmt_cell(v)}{C.N}" for v, color in zip(rows[idx], colors)])
+        
+        clear_screen()
+        print_section_header(title)
+        if tbl:
+            print(tabulate(tbl, headers=[f"{C.H}#"] + [f"{C.H}{h}" for h in headers],
+                          tablefmt="fancy_grid", stralign="left"))
+        else:
+            print(f"\n{C.W}⚠ No rows match '{query}'{C.N}")
+        
+        status = f"{C.I}📄 Page {C.W}{page + 1}/{pages}{C.I} | Rows {C.W}{start + 1 if window else 0}-{start + len(window)}{C.I} of {C.W}{len(view)}{C.N}"
+        if query:
+            status += f" {C.I}(filtered from {len(rows)}) | Search: {C.G}{query}{C.N}"
+        if sort_col is not None:
+            status += f" {C.I}| Sort: {C.G}{headers[sort_col]} {'▼' if sort_desc else '▲'}{C.N}"
+        print(f"\n{status}")
+        print(f"{C.D}[ENTER/n] next  [p] prev  [g N] go to page  [/text] search  [/] clear  [s N] sort by column N  [q] quit{C.N}")
+        
+        cmd = input(f"{C.H}└─► {C.N}").strip()
+        
+        if cmd in ("", "n"):
+            page += 1
+        elif cmd == "p":
+            page -= 1
+        elif cmd == "q":
+            return
+        elif cmd.startswith("g") and cmd[1:].strip().isdigit():
+            page = int(cmd[1:].strip()) - 1
+        elif cmd.startswith("/"):
+            query = cmd[1:].strip().lower()
+            view = [i for i, text in enumerate(index) if query in text] if query else list(range(len(rows)))
+            if sort_col is not None:
+                view = sort_view(view, rows, sort_col, sort_desc)
+            page = 0
+        elif cmd.startswith("s") and cmd[1:].strip().isdigit():
+            col = int(cmd[1:].strip()) - 1
+            if 0 <= col < len(headers):
+                # Sorting the same column again flips the direction
+                sort_desc = not sort_desc if col == sort_col else False
+                sort_col = col
+                view = sort_view(view, rows, sort_col, sort_desc)
+                page = 0
+
 def list_domain_breaches():
     """Enhanced domain breach lister with proper API implementation"""
     print_section_header("🌐 DOMAIN BREACH LISTER")
@@ -339,8 +514,10 @@ def list_domain_breaches():
             'User-Agent': 'XposedOrNot-CLI/1.0'
         }
         
-        response = requests.post(f"{BASE}/domain-breaches", headers=headers, timeout=15)
-        data = handle(response)
+        if SERVICE:
+            data = handle(api_get("domain-breaches", f"{BASE}/domain-breaches", {}, timeout=15))
+        else:
+            data = fetch_catalog("POST", f"{BASE}/domain-breaches", headers=headers, timeout=15)
         
         if not data: 
             print(f"{C.E}❌ Failed to retrieve domain breach data{C.N}")
@@ -355,31 +532,20 @@ def list_domain_breaches():
             breaches = data
         
         if breaches:
-            print(f"\n{C.E}🚨 DOMAIN BREACH DATABASE{C.N}")
-            print(f"{C.E}{'▓' * 60}{C.N}")
-            print(f"{C.I}📊 Total breaches found: {C.W}{len(breaches)}{C.N}")
-            
-            table_data = []
-            for i, breach in enumerate(breaches[:25], 1):  # Limit to first 25 for readability
+            rows = []
+            for breach in breaches:
                 breach_name = breach.get("breach", breach.get("name", "Unknown"))
                 domain = breach.get("domain", breach.get("Domain", "N/A"))
                 records = breach.get("xposed_records", breach.get("records", breach.get("exposed_records", "N/A")))
                 
-                # Format large numbers
+                # Keep counts numeric so they sort by value, formatting happens at render time
                 if isinstance(records, (int, str)) and str(records).isdigit():
-                    records = f"{int(records):,}"
+                    records = int(records)
                 
-                table_data.append([
-                    f"{C.W}{i}{C.N}",
-                    f"{C.E}{breach_name}{C.N}",
-                    f"{C.I}{domain}{C.N}",
-                    f"{C.W}{records}{C.N}"
-                ])
-            
-            print(f"\n{tabulate(table_data, headers=[f'{C.H}#', f'{C.H}Breach Name', f'{C.H}Domain', f'{C.H}Records Exposed'], tablefmt='fancy_grid', stralign='left')}")
+                rows.append((breach_name, domain, records))
             
-            if len(breaches) > 25:
-                print(f"\n{C.I}📝 Showing first 25 of {len(breaches)} total breaches{C.N}")
+            page_view("🌐 DOMAIN BREACH DATABASE", ["Breach Name", "Domain", "Records Exposed"],
+                      rows, [C.E, C.I, C.W])
                 
             print(f"\n{C.W}⚠ SECURITY INSIGHT: These domains have experienced data breaches{C.N}")
             
@@ -402,18 +568,20 @@ def list_breaches():
     url = f"{BASE}/breaches?domain={dom}" if dom else f"{BASE}/breaches"
     print(f"{C.I}Loading breaches{C.N}")
     spin("Loading")
-    data = handle(requests.get(url, timeout=10))
+    if SERVICE:
+        data = handle(api_get("breaches", url, {"domain": dom}))
+    else:
+        data = fetch_catalog("GET", url, timeout=10)
     if not data: return
     br = data.get("exposedBreaches") or data.get("Exposed Breaches") or []
     if br:
-        tbl = []
-        for b in br[:20]:
+        rows = []
+        for b in br:
             rid = b.get("breachID") or b.get("Breach ID")
             dom = b.get("domain") or b.get("Domain")
             dt = b.get("breachedDate") or b.get("Breached Date","")
-            tbl.append([rid,dom,dt.split("T")[0]])
-        print(f"\n{C.S}First {len(tbl)} breaches:{C.N}")
-        print(tabulate(tbl,headers=["ID","Domain","Date"],tablefmt="fancy_grid"))
+            rows.append((rid,dom,dt.split("T")[0]))
+        page_view("📋 BREACH CATALOG", ["ID","Domain","Date"], rows, [C.E, C.I, C.W])
     else:
         print(f"\n{C.S}✅ No breaches.{C.N}")
 
@@ -448,11 +616,17 @@ def main():
         if act:
             print(f"\n{C.I}🚀 Launching: {act[0]}{C.N}")
             time.sleep(0.5)
-            act[1]()
+            with tracing.span("action", option=act[0]):
+                act[1]()
             input(f"\n{C.W}Press ENTER to continue...{C.N}")
         else:
             print(f"{C.E}❌ Invalid option. Try again.{C.N}")
             time.sleep(1)
 
 if __name__ == "__main__":
+    # Only when run as the console, importing (e.g. from lookupservice.py) must not touch pip
+    verify_system_requirements()
+    parser = argparse.ArgumentParser(description="BreachChecker interactive console")
+    tracing.add_arguments(parser)
+    tracing.configure(parser.parse_args())
     main()
@@ -7,6 +7,9 @@ import argparse
 import sys
 from typing import Dict, List, Any, Optional
 import time
+import gc
+import random
+import tracemalloc
 import dns.resolver
 import whois
 from selenium import webdriver
@@ -16,6 +19,115 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from bs4 import BeautifulSoup
 import socket
+import tracing
+
+def _intern(value: Any) -> Any:
+    """Intern strings so repeated values share one object across records"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _intern_all(values: Optional[List[Any]]) -> tuple:
+    """Compact a list of strings into an interned tuple"""
+    return tuple(_intern(v) for v in values or ())
+
+class StealerRecord:
+    """Hudson Rock infostealer entry"""
+    __slots__ = ('date_compromised', 'ip', 'computer_name', 'operating_system',
+                 'top_logins', 'top_passwords')
+
+    def __init__(self, date_compromised=None, ip=None, computer_name=None,
+                 operating_system=None, top_logins=(), top_passwords=()):
+        self.date_compromised = date_compromised
+        self.ip = ip
+        self.computer_name = computer_name
+        self.operating_system = _intern(operating_system)
+        self.top_logins = _intern_all(top_logins)
+        self.top_passwords = tuple(top_passwords or ())
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'StealerRecord':
+        return cls(data.get('date_compromised'), data.get('ip'), data.get('computer_name'),
+                   data.get('operating_system'), data.get('top_logins'), data.get('top_passwords'))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'date_compromised': self.date_compromised,
+            'ip': self.ip,
+            'computer_name': self.computer_name,
+            'operating_system': self.operating_system,
+            'top_logins': list(self.top_logins),
+            'top_passwords': list(self.top_passwords)
+        }
+
+class BreachRecord:
+    """Have I Been Pwned breach entry"""
+    __slots__ = ('name', 'breach_date')
+
+    def __init__(self, name=None, breach_date=None):
+        self.name = _intern(name)
+        self.breach_date = _intern(breach_date)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BreachRecord':
+        return cls(data.get('Name'), data.get('BreachDate'))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'Name': self.name, 'BreachDate': self.breach_date}
+
+class DehashedEntry:
+    """Dehashed search hit"""
+    __slots__ = ('email', 'password', 'source')
+
+    def __init__(self, email=None, password=None, source=None):
+        self.email = _intern(email)
+        self.password = password
+        self.source = _intern(source)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DehashedEntry':
+        return cls(data.get('email'), data.get('password'), data.get('source'))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'email': self.email, 'password': self.password, 'source': self.source}
+
+def parse_hudson(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the Hudson Rock fields the report uses, as compact records"""
+    return {
+        'stealers': [StealerRecord.from_dict(s) for s in data.get('stealers') or []],
+        'total_corporate_services': data.get('total_corporate_services', 0),
+        'total_user_services': data.get('total_user_services', 0)
+    }
+
+def parse_hibp(data: Any) -> Dict[str, Any]:
+    """HIBP answers with a bare list of breaches"""
+    if isinstance(data, dict):
+        data = data.get('breaches', [])
+    return {'breaches': [BreachRecord.from_dict(b) for b in data or []]}
+
+def parse_dehashed(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the Dehashed total and entries as compact records"""
+    return {
+        'total': data.get('total', 0),
+        'entries': [DehashedEntry.from_dict(e) for e in data.get('entries') or []]
+    }
+
+def from_service(data: Dict[str, Any], parser) -> Dict[str, Any]:
+    """Rebuild records from a lookup service payload, errors pass through untouched"""
+    return data if 'error' in data else parser(data)
+
+def service_osint_search(service: str, email: str) -> tuple:
+    """Run every OSINT lookup through a shared lookupservice.py instance"""
+    # The service runs all providers back to back, so allow well over a single provider timeout
+    with tracing.span("http.service"):
+        response = requests.get(f"{service}/osint", params={"email": email}, timeout=180)
+    with tracing.span("decode.json"):
+        data = response.json()
+    if response.status_code != 200:
+        raise RuntimeError(data.get('error', f"Lookup service returned status code {response.status_code}"))
+    return (from_service(data['hudson'], parse_hudson),
+            from_service(data['hibp'], parse_hibp),
+            from_service(data['dehashed'], parse_dehashed),
+            data['whois'],
+            data['dns'])
 
 class AdvancedOSINTTool:
     def __init__(self):
@@ -34,9 +146,13 @@ class AdvancedOSINTTool:
     def hudson_rock_search(self, email: str) -> Dict[str, Any]:
         """Search Hudson Rock for compromised credentials"""
         try:
-            response = self.session.get(f"{self.hudson_rock_url}?email={email}", timeout=30)
+            with tracing.span("http.hudson"):
+                response = self.session.get(f"{self.hudson_rock_url}?email={email}", timeout=30)
             if response.status_code == 200:
-                return response.json()
+                with tracing.span("decode.json"):
+                    data = response.json()
+                with tracing.span("parse.hudson"):
+                    return parse_hudson(data)
             return {"error": f"API returned status code {response.status_code}"}
         except Exception as e:
             return {"error": f"Hudson Rock search failed: {str(e)}"}
@@ -48,9 +164,13 @@ class AdvancedOSINTTool:
             headers['hibp-api-key'] = hibp_api_key
             
         try:
-            response = self.session.get(f"{self.hibp_url}{email}", headers=headers, timeout=30)
+            with tracing.span("http.hibp"):
+                response = self.session.get(f"{self.hibp_url}{email}", headers=headers, timeout=30)
             if response.status_code == 200:
-                return response.json()
+                with tracing.span("decode.json"):
+                    data = response.json()
+                with tracing.span("parse.hibp"):
+                    return parse_hibp(data)
             elif response.status_code == 404:
                 return {"breaches": []}
             else:
@@ -69,13 +189,17 @@ class AdvancedOSINTTool:
         }
         
         try:
-            response = self.session.get(
-                f"{self.dehashed_url}?query=email:{email}",
-                headers=headers,
-                timeout=30
-            )
+            with tracing.span("http.dehashed"):
+                response = self.session.get(
+                    f"{self.dehashed_url}?query=email:{email}",
+                    headers=headers,
+                    timeout=30
+                )
             if response.status_code == 200:
-                return response.json()
+                with tracing.span("decode.json"):
+                    data = response.json()
+                with tracing.span("parse.dehashed"):
+                    return parse_dehashed(data)
             else:
                 return {"error": f"Dehashed API returned status code {response.status_code}"}
         except Exception as e:
@@ -90,7 +214,8 @@ class AdvancedOSINTTool:
     def domain_whois_lookup(self, domain: str) -> Dict[str, Any]:
         """Perform WHOIS lookup on domain"""
         try:
-            domain_info = whois.whois(domain)
+            with tracing.span("whois", domain=domain):
+                domain_info = whois.whois(domain)
             return {
                 "registrar": domain_info.registrar,
                 "creation_date": str(domain_info.creation_date),
@@ -108,7 +233,8 @@ class AdvancedOSINTTool:
         
         for record_type in record_types:
             try:
-                answers = dns.resolver.resolve(domain, record_type)
+                with tracing.span(f"dns.{record_type}", domain=domain):
+                    answers = dns.resolver.resolve(domain, record_type)
                 results[record_type] = [str(r) for r in answers]
             except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.resolver.NoNameservers):
                 results[record_type] = []
@@ -152,12 +278,12 @@ class AdvancedOSINTTool:
             for i, breach in enumerate(hudson_data['stealers'], 1):
                 report.extend([
                     f"\nBreach #{i}:",
-                    f"  Date: {breach.get('date_compromised', 'Unknown')}",
-                    f"  IP: {breach.get('ip', 'Unknown')}",
-                    f"  Computer: {breach.get('computer_name', 'Unknown')}",
-                    f"  OS: {breach.get('operating_system', 'Unknown')}",
-                    f"  Top Logins: {', '.join(breach.get('top_logins', []))}",
-                    f"  Top Passwords: {', '.join(breach.get('top_passwords', []))}"
+                    f"  Date: {breach.date_compromised or 'Unknown'}",
+                    f"  IP: {breach.ip or 'Unknown'}",
+                    f"  Computer: {breach.computer_name or 'Unknown'}",
+                    f"  OS: {breach.operating_system or 'Unknown'}",
+                    f"  Top Logins: {', '.join(breach.top_logins)}",
+                    f"  Top Passwords: {', '.join(breach.top_passwords)}"
                 ])
         else:
             report.append("Status: No compromises found in Hudson Rock database")
@@ -174,7 +300,7 @@ class AdvancedOSINTTool:
             if hibp_data['breaches']:
                 report.append(f"Status: Found in {len(hibp_data['breaches'])} breaches")
                 for breach in hibp_data['breaches']:
-                    report.append(f"  - {breach.get('Name', 'Unknown')} ({breach.get('BreachDate', 'Unknown date')})")
+                    report.append(f"  - {breach.name or 'Unknown'} ({breach.breach_date or 'Unknown date'})")
             else:
                 report.append("Status: No breaches found in HIBP database")
         else:
@@ -191,7 +317,7 @@ class AdvancedOSINTTool:
         elif 'entries' in dehashed_data and dehashed_data['entries']:
             report.append(f"Status: Found {dehashed_data.get('total', 0)} entries")
             for entry in dehashed_data['entries'][:5]:  # Show first 5 entries
-                report.append(f"  - {entry.get('email', 'N/A')} | {entry.get('password', 'N/A')} | {entry.get('source', 'Unknown source')}")
+                report.append(f"  - {entry.email or 'N/A'} | {entry.password or 'N/A'} | {entry.source or 'Unknown source'}")
         else:
             report.append("Status: No data found in Dehashed database")
         
@@ -255,7 +381,78 @@ class AdvancedOSINTTool:
             print(f"Error saving report: {e}")
             return None
 
+def synthetic_hudson_payload(rng: random.Random) -> str:
+    """Build a Hudson Rock style JSON body with realistic value repetition"""
+    systems = ["Windows 10 Pro x64", "Windows 11 Home x64", "Windows 10 Home x64", "Windows 7 Ultimate x64"]
+    sites = [f"https://login.site{n}.com" for n in range(200)]
+    stealers = []
+    for _ in range(rng.randint(1, 5)):
+        stealers.append({
+            "date_compromised": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T00:00:00.000Z",
+            "ip": f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.***.***",
+            "computer_name": f"DESKTOP-{rng.randint(0, 0xFFFFFF):06X}",
+            "operating_system": rng.choice(systems),
+            "malware_path": "C:\\Users\\user\\AppData\\Local\\Temp\\stealer.exe",
+            "antiviruses": ["Windows Defender"],
+            "top_logins": rng.sample(sites, 10),
+            "top_passwords": [f"p******{rng.randint(0, 99)}" for _ in range(5)]
+        })
+    return json.dumps({
+        "message": "This email address is associated with a computer that was infected by an info-stealer",
+        "stealers": stealers,
+        "total_corporate_services": rng.randint(0, 20),
+        "total_user_services": rng.randint(0, 200)
+    })
+
+def benchmark_memory(targets: int = 5000):
+    """Compare retained memory of raw Hudson Rock payloads against parsed records"""
+    rng = random.Random(1337)
+    bodies = [synthetic_hudson_payload(rng) for _ in range(targets)]
+
+    def measure(loader):
+        gc.collect()
+        tracemalloc.start()
+        kept = [loader(body) for body in bodies]
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del kept
+        return current
+
+    def pruned(body):
+        # Same fields parse_hudson keeps, still as plain dicts and lists without interning
+        data = json.loads(body)
+        return {
+            'stealers': [{k: s.get(k) for k in StealerRecord.__slots__} for s in data.get('stealers') or []],
+            'total_corporate_services': data.get('total_corporate_services', 0),
+            'total_user_services': data.get('total_user_services', 0)
+        }
+
+    raw = measure(json.loads)
+    trimmed = measure(pruned)
+    compact = measure(lambda body: parse_hudson(json.loads(body)))
+
+    print(f"Synthetic targets: {targets}")
+    print(f"Raw dicts:       {raw / 1024 / 1024:8.2f} MiB ({raw // targets} bytes/target)")
+    print(f"Pruned dicts:    {trimmed / 1024 / 1024:8.2f} MiB ({trimmed // targets} bytes/target)")
+    print(f"Slotted records: {compact / 1024 / 1024:8.2f} MiB ({compact // targets} bytes/target)")
+    print(f"Field pruning:   {100 * (1 - trimmed / raw):8.1f}% less than raw")
+    print(f"Slots/interning: {100 * (1 - compact / trimmed):8.1f}% less than pruned dicts")
+
 def main():
+    parser = argparse.ArgumentParser(description="Advanced OSINT Tool")
+    parser.add_argument('--bench-memory', type=int, metavar='N',
+                        help="measure retained memory for N synthetic Hudson Rock payloads and exit")
+    parser.add_argument('--service', default=os.environ.get("BREACHCHECKER_SERVICE", ""),
+                        help="shared lookup service URL (default: $BREACHCHECKER_SERVICE)")
+    tracing.add_arguments(parser)
+    args = parser.parse_args()
+    tracing.configure(args)
+
+    if args.bench_memory:
+        benchmark_memory(args.bench_memory)
+        return
+
     print(r"""
                                                                                                             
     """)
@@ -279,27 +476,44 @@ def main():
     
     print("\n[+] Searching OSINT sources...")
     
-    # Search various sources
-    hudson_data = tool.hudson_rock_search(email)
-    hibp_data = tool.haveibeenpwned_search(email)  # Note: HIBP requires API key for full access
-    dehashed_data = tool.dehashed_search(email)  # Note: Dehashed requires API key
-    
-    # Domain analysis
-    domain = email.split('@')[-1]
-    whois_data = tool.domain_whois_lookup(domain)
-    dns_data = tool.dns_lookup(domain)
+    if args.service:
+        try:
+            with tracing.span("provider.service"):
+                hudson_data, hibp_data, dehashed_data, whois_data, dns_data = \
+                    service_osint_search(args.service.rstrip('/'), email)
+        except Exception as e:
+            print(f"Error: Lookup service failed: {e}")
+            return
+    else:
+        # Search various sources
+        with tracing.span("provider.hudson"):
+            hudson_data = tool.hudson_rock_search(email)
+        with tracing.span("provider.hibp"):
+            hibp_data = tool.haveibeenpwned_search(email)  # Note: HIBP requires API key for full access
+        with tracing.span("provider.dehashed"):
+            dehashed_data = tool.dehashed_search(email)  # Note: Dehashed requires API key
+        
+        # Domain analysis
+        domain = email.split('@')[-1]
+        with tracing.span("provider.whois"):
+            whois_data = tool.domain_whois_lookup(domain)
+        with tracing.span("provider.dns"):
+            dns_data = tool.dns_lookup(domain)
     
     # Generate report
-    report = tool.analyze_results(email, hudson_data, hibp_data, dehashed_data, whois_data, dns_data)
+    with tracing.span("analyze"):
+        report = tool.analyze_results(email, hudson_data, hibp_data, dehashed_data, whois_data, dns_data)
     
     # Display report
-    print("\n" + "=" * 80)
-    print("SEARCH RESULTS:")
-    print("=" * 80)
-    print(report)
+    with tracing.span("render"):
+        print("\n" + "=" * 80)
+        print("SEARCH RESULTS:")
+        print("=" * 80)
+        print(report)
     
     # Save report
-    filename = tool.save_report(email, report)
+    with tracing.span("save"):
+        filename = tool.save_report(email, report)
     if filename:
         print(f"\n[+] Report saved to: {filename}")
     else:
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Shared lookup service for BreachChecker.
+
+Runs the email, analytics, password-prefix, catalog and OSINT lookups behind
+one local HTTP/JSON endpoint so several analysts share a single cache and a
+single set of upstream connections. Point the CLIs at it with:
+
+    BREACHCHECKER_SERVICE=http://127.0.0.1:8787 ./breachchecker.py
+    BREACHCHECKER_SERVICE=http://127.0.0.1:8787 python detailscheck.py
+"""
+
+import argparse
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+import breachchecker
+import detailscheck
+
+# Max concurrent calls per upstream, shared by every client of the service
+UPSTREAM_LIMITS = {
+    "xposedornot": 4,
+    "passwords": 2,
+    "hudsonrock": 2,
+    "hibp": 1,
+    "dehashed": 1,
+    "dns": 8
+}
+
+# Seconds a result stays fresh, catalogs are revalidated with ETags after that.
+# OSINT reports are not cached whole, each provider result is cached on its own.
+CACHE_TTL = {
+    "email": 15 * 60,
+    "analytics": 15 * 60,
+    "password": 24 * 60 * 60,
+    "breaches": 5 * 60,
+    "domain-breaches": 5 * 60,
+    "osint.provider": 15 * 60
+}
+
+# Only definitive answers are cached, rate limits and server errors are retried
+CACHEABLE = (200, 404)
+
+# Upper bound on cached results, least recently used entries are evicted first
+MAX_CACHE_ENTRIES = 10000
+
+# How long catalog validators are kept for revalidation once the result TTL expires
+VALIDATOR_TTL = 24 * 60 * 60
+
+class LookupCache:
+    """Thread-safe, size-bounded TTL cache"""
+
+    def __init__(self, max_entries=MAX_CACHE_ENTRIES):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.max_entries = max_entries
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                return entry[1]
+            self._entries.pop(key, None)
+            return None
+
+    def put(self, key, ttl, result):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+class Coalescer:
+    """Collapse concurrent identical lookups into one upstream call"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    def run(self, key, fn):
+        with self._lock:
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = Future()
+                self._inflight[key] = fut
+
+        if not leader:
+            return fut.result()
+
+        try:
+            result = fn()
+            fut.set_result(result)
+            return result
+        except Exception as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+class LookupService:
+    """Lookup handlers with a shared cache, coalescing and per-upstream limits"""
+
+    def __init__(self):
+        self.cache = LookupCache()
+        # Catalog ETag/Last-Modified and bodies, kept in memory rather than the CLI's home-dir file
+        self.validators = LookupCache()
+        self.coalescer = Coalescer()
+        self.limits = {name: threading.BoundedSemaphore(n) for name, n in UPSTREAM_LIMITS.items()}
+        self._local = threading.local()
+        self.routes = {
+            "email": self.email,
+            "analytics": self.analytics,
+            "password": self.password,
+            "breaches": self.breaches,
+            "domain-breaches": self.domain_breaches,
+            "osint": self.osint
+        }
+
+    def tool(self):
+        # requests.Session is not guaranteed thread-safe, keep one tool per worker thread
+        if not hasattr(self._local, "tool"):
+            self._local.tool = detailscheck.AdvancedOSINTTool()
+        return self._local.tool
+
+    def session(self):
+        # Same reasoning as tool(), catalog refreshes get their own per-thread session
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def upstream(self, name, fn, *args, **kwargs):
+        with self.limits[name]:
+            return fn(*args, **kwargs)
+
+    def get_json(self, name, url, timeout=10):
+        r = self.upstream(name, requests.get, url, timeout=timeout)
+        return r.status_code, r.json() if r.status_code == 200 else None
+
+    def email(self, q):
+        e = q.get("email", "")
+        return self.get_json("xposedornot", f"{breachchecker.BASE}/check-email/{e}")
+
+    def analytics(self, q):
+        e = q.get("email", "")
+        return self.get_json("xposedornot", f"{breachchecker.BASE}/breach-analytics?email={e}")
+
+    def password(self, q):
+        # Only the hash prefix ever reaches the service, never the password
+        h = q.get("prefix", "")[:10]
+        return self.get_json("passwords", f"{breachchecker.PASS_API}/pass/anon/{h}")
+
+    def breaches(self, q):
+        dom = q.get("domain", "")
+        url = f"{breachchecker.BASE}/breaches?domain={dom}" if dom else f"{breachchecker.BASE}/breaches"
+        return self.upstream("xposedornot", self.catalog, "GET", url)
+
+    def domain_breaches(self, q):
+        headers = {
+            'Content-Length': '0',
+            'User-Agent': 'XposedOrNot-CLI/1.0'
+        }
+        return self.upstream("xposedornot", self.catalog, "POST",
+                             f"{breachchecker.BASE}/domain-breaches", headers=headers, timeout=15)
+
+    def catalog(self, method, url, headers=None, timeout=10):
+        """Revalidate a catalog against the in-memory validators, a 304 is served as 200"""
+        hdrs = dict(headers or {})
+        # Validators only mean "send 304" for GET, a POST answers a match with 412
+        entry = self.validators.get(url) if method == "GET" else None
+        if entry:
+            if entry.get("etag"):
+                hdrs['If-None-Match'] = entry["etag"]
+            if entry.get("last_modified"):
+                hdrs['If-Modified-Since'] = entry["last_modified"]
+
+        r = self.session().request(method, url, headers=hdrs, timeout=timeout)
+        if r.status_code == 304 and entry:
+            return 200, entry["data"]
+        if r.status_code != 200:
+            return r.status_code, None
+
+        data = r.json()
+        etag, modified = r.headers.get('ETag'), r.headers.get('Last-Modified')
+        if method == "GET" and (etag or modified):
+            self.validators.put(url, VALIDATOR_TTL, {"etag": etag, "last_modified": modified, "data": data})
+        return 200, data
+
+    def osint(self, q):
+        email = q.get("email", "")
+        tool = self.tool()
+        if not tool.check_email_format(email):
+            return 400, {"error": "Invalid email format"}
+
+        domain = email.split('@')[-1]
+        return 200, {
+            "hudson": self.provider("hudson", "hudsonrock", tool.hudson_rock_search, email),
+            "hibp": self.provider("hibp", "hibp", tool.haveibeenpwned_search, email),
+            "dehashed": self.provider("dehashed", "dehashed", tool.dehashed_search, email),
+            "whois": self.provider("whois", "dns", tool.domain_whois_lookup, domain),
+            "dns": self.provider("dns", "dns", tool.dns_lookup, domain)
+        }
+
+    def provider(self, name, limit, fn, arg):
+        """Run one OSINT provider, caching its result only when it succeeded"""
+        key = f"osint.{name}?{arg}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self.upstream(limit, fn, arg)
+        if not is_error(result):
+            self.cache.put(key, CACHE_TTL["osint.provider"], result)
+        return result
+
+    def lookup(self, kind, q):
+        """Serve from cache, otherwise run (or join) the upstream lookup"""
+        key = f"{kind}?{'&'.join(f'{k}={v}' for k, v in sorted(q.items()))}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        def fetch():
+            result = self.routes[kind](q)
+            if kind in CACHE_TTL and result[0] in CACHEABLE:
+                self.cache.put(key, CACHE_TTL[kind], result)
+            return result
+
+        return self.coalescer.run(key, fetch)
+
+def is_error(result):
+    """Providers report failures (429s, timeouts) as an 'error' key, DNS per record type"""
+    return 'error' in result or any(isinstance(v, str) and v.startswith("Error:")
+                                    for v in result.values())
+
+def to_json(o):
+    return o.to_dict() if hasattr(o, "to_dict") else str(o)
+
+def make_handler(service):
+
+    class LookupHandler(BaseHTTPRequestHandler):
+
+        def send_json(self, status, body):
+            payload = json.dumps(body, default=to_json).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            kind = url.path.strip("/")
+            q = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+            if kind == "health":
+                self.send_json(200, {"status": "ok"})
+                return
+            if kind not in service.routes:
+                self.send_json(404, {"error": f"Unknown lookup: {kind}"})
+                return
+
+            try:
+                status, body = service.lookup(kind, q)
+            except requests.exceptions.Timeout:
+                status, body = 504, {"error": "Upstream timeout"}
+            except requests.exceptions.ConnectionError:
+                status, body = 502, {"error": "Unable to reach upstream"}
+            except Exception as e:
+                status, body = 500, {"error": str(e)}
+            self.send_json(status, body)
+
+    return LookupHandler
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared BreachChecker lookup service")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8787, help="port to listen on (default: 8787)")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(LookupService()))
+    print(f"Lookup service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
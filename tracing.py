@@ -0,0 +1,144 @@
+"""
+Stage-level tracing and profiling for BreachChecker runs.
+
+Spans are recorded in the Chrome trace event format, so a trace file can be
+opened in chrome://tracing, https://ui.perfetto.dev or speedscope. Tracing is
+off by default and span() costs a single flag check until enable() is called.
+"""
+
+import atexit
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+
+_lock = threading.Lock()
+_events = []
+_trace_path = None
+_profiler = None
+
+def _now_us():
+    return int(time.perf_counter() * 1000000)
+
+@contextmanager
+def span(name, **args):
+    """Record the wrapped block as one complete event on the timeline"""
+    if _trace_path is None:
+        yield
+        return
+
+    start = _now_us()
+    try:
+        yield
+    finally:
+        event = {
+            "name": name,
+            "cat": name.split(".")[0],
+            "ph": "X",
+            "ts": start,
+            "dur": _now_us() - start,
+            "pid": os.getpid(),
+            "tid": threading.get_ident()
+        }
+        if args:
+            event["args"] = {k: str(v) for k, v in args.items()}
+        with _lock:
+            _events.append(event)
+
+def traced(name):
+    """Decorator form of span()"""
+    def wrap(fn):
+        @wraps(fn)
+        def inner(*a, **kw):
+            with span(name):
+                return fn(*a, **kw)
+        return inner
+    return wrap
+
+def enable(path):
+    """Start collecting spans, the trace file is written when the process exits"""
+    global _trace_path
+    _trace_path = path
+    atexit.register(save)
+
+def save():
+    """Write collected spans to the trace file"""
+    if _trace_path is None:
+        return
+    with _lock:
+        events = list(_events)
+    with open(_trace_path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+class SamplingProfiler(threading.Thread):
+    """Periodically sample the main thread stack and count folded stacks"""
+
+    def __init__(self, interval=0.005):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = Counter()
+        self.target = threading.main_thread().ident
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def dump(self, path):
+        # Folded stack format, readable by flamegraph.pl and speedscope
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+def start_profile(mode, path):
+    """Start a 'cprofile' or 'sample' profiler that writes to path at exit"""
+    global _profiler
+    if mode == "cprofile":
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+        def finish():
+            _profiler.disable()
+            _profiler.dump_stats(path)
+    else:
+        _profiler = SamplingProfiler()
+        _profiler.start()
+
+        def finish():
+            _profiler.stop()
+            _profiler.dump(path)
+
+    atexit.register(finish)
+
+def add_arguments(parser):
+    """Register the shared --trace/--profile flags on an argparse parser"""
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write a stage-level trace (Chrome trace format) to FILE")
+    parser.add_argument("--profile", choices=["cprofile", "sample"],
+                        help="also profile the run with cProfile or a stack sampler")
+    parser.add_argument("--profile-out", metavar="FILE",
+                        help="profile output path (default: profile.prof or profile.folded)")
+
+def configure(args):
+    """Apply parsed --trace/--profile flags"""
+    if args.trace:
+        enable(args.trace)
+    if args.profile:
+        default = "profile.prof" if args.profile == "cprofile" else "profile.folded"
+        start_profile(args.profile, args.profile_out or default)